@@ -16,6 +16,7 @@ pdfplumber       :mod:`.pdfplumber_backend`        ``pdf-converter[pdfplumber]``
 
 import importlib
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 from types import ModuleType
 
@@ -102,7 +103,7 @@ def convert_to_markdown(method: str, input_file: Path | None = None, **options)
     Args:
         method: Backend name, e.g. ``"docling-serve"``.
         input_file: PDF to convert. Optional for remote backends that receive a
-            ``source_url`` in ``options`` instead.
+            ``source_url`` or ``file_content`` in ``options`` instead.
         **options: Backend-specific options. Backends that do not understand
             them log a warning.
 
@@ -133,6 +134,22 @@ def convert_to_text(method: str, input_file: Path) -> str:
     return _load(TEXT_BACKENDS, method, "text").to_text(input_file)
 
 
+def iter_text(method: str, input_file: Path) -> Iterator[str]:
+    """Yield the plain text of a PDF page by page with the backend named ``method``.
+
+    Joining the pages with ``"\\n"`` gives the result of :func:`convert_to_text`.
+
+    Args:
+        method: Backend name, e.g. ``"pdfplumber"``.
+        input_file: PDF to read.
+
+    Raises:
+        UnknownBackend: If ``method`` is not a known text backend.
+        MissingBackendDependency: If the backend's dependency is not installed.
+    """
+    return _load(TEXT_BACKENDS, method, "text").iter_text(input_file)
+
+
 __all__ = [
     "BACKEND_EXTRAS",
     "DEFAULT_METHOD",
@@ -146,5 +163,6 @@ __all__ = [
     "convert_to_markdown",
     "convert_to_text",
     "is_remote",
+    "iter_text",
     "validate_method",
 ]
@@ -4,13 +4,27 @@ Extra: ``docling``. This is by far the heaviest backend — it pulls in torch an
 the docling model stack. Prefer ``docling-serve`` if a server is available.
 """
 
+import functools
+import threading
 from pathlib import Path
+from typing import Any
 
 from pdf_converter.backends.base import require, warn_unused_options
 
 NAME = "docling"
 EXTRA = "docling"
 
+# Conversions share one converter, and with it the loaded models; it is not
+# documented as safe for concurrent use, so calls are serialised.
+_convert_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _document_converter() -> Any:
+    """Build the docling converter once per process; construction loads its models."""
+    docling = require("docling.document_converter", backend=NAME, extra=EXTRA)
+    return docling.DocumentConverter()
+
 
 def to_markdown(input_file: Path, **options) -> str:
     """Convert a PDF to markdown with a locally running docling pipeline.
@@ -23,7 +37,7 @@ def to_markdown(input_file: Path, **options) -> str:
         Markdown content.
     """
     warn_unused_options(NAME, options)
-    docling = require("docling.document_converter", backend=NAME, extra=EXTRA)
+    converter = _document_converter()
 
-    converter = docling.DocumentConverter()
-    return converter.convert(input_file).document.export_to_markdown()
+    with _convert_lock:
+        return converter.convert(input_file).document.export_to_markdown()
@@ -36,7 +36,8 @@ def to_markdown(input_file: Path | None = None, **options) -> str:
     """Convert a PDF to markdown via the Docling Serve async source API.
 
     Args:
-        input_file: Local PDF uploaded as base64 when ``source_url`` is not set.
+        input_file: Local PDF uploaded as base64 when neither ``source_url`` nor
+            ``file_content`` is set.
         **options: Forwarded to
             :func:`pdf_converter.docling_client.convert_file_to_markdown`.
             ``source_url`` is optional and only works for allowlisted hosts.
@@ -1,12 +1,12 @@
 """Embedded-image extraction from PDFs.
 
-Extra: ``images`` (installs ``pymupdf`` and ``pillow``). Not a conversion
+Extra: ``images`` (installs ``pymupdf``). Not a conversion
 backend — used alongside one when a document's pictures are wanted as files.
 """
 
-import io
 import logging
 from pathlib import Path
+from typing import Any
 
 from pdf_converter.backends.base import require
 
@@ -16,8 +16,18 @@ EXTRA = "images"
 logger = logging.getLogger(__name__)
 
 
+# Formats that are written as extracted; anything else is re-encoded to PNG.
+_NATIVE_EXTENSIONS = frozenset({"png", "jpeg"})
+_CMYK_COMPONENTS = 4
+
+
 def extract_images(input_file: Path, output_folder: Path) -> list[Path]:
-    """Write every embedded image of a PDF into ``output_folder`` as PNG.
+    """Write every embedded image of a PDF into ``output_folder``.
+
+    PNG and JPEG streams are written as stored in the PDF, without decoding
+    them. Other formats (JPEG 2000, JBIG2, ...) and CMYK images are decoded by
+    MuPDF and written as PNG, converted to RGB where PNG cannot hold the colour
+    space.
 
     Args:
         input_file: PDF to read.
@@ -27,21 +37,22 @@ def extract_images(input_file: Path, output_folder: Path) -> list[Path]:
         Paths of the images that were written successfully.
     """
     fitz = require("fitz", backend=NAME, extra=EXTRA)
-    pil_image = require("PIL.Image", backend=NAME, extra=EXTRA)
 
     output_folder.mkdir(parents=True, exist_ok=True)
     written: list[Path] = []
 
     with fitz.open(input_file) as pdf_document:
         img_index = 0
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)
-            for img in page.get_images(full=True):
+        for page in pdf_document:
+            for img in page.get_images():
                 try:
                     base_image = pdf_document.extract_image(img[0])
-                    image = pil_image.open(io.BytesIO(base_image["image"]))
-                    image_path = output_folder / f"img_{img_index}.png"
-                    image.save(image_path)
+                    if base_image["ext"] in _NATIVE_EXTENSIONS and base_image["colorspace"] != _CMYK_COMPONENTS:
+                        image_path = output_folder / f"img_{img_index}.{base_image['ext']}"
+                        image_path.write_bytes(base_image["image"])
+                    else:
+                        image_path = output_folder / f"img_{img_index}.png"
+                        _save_as_png(fitz, pdf_document, img[0], image_path)
                     logger.info("Extracted image %s", image_path.name)
                     written.append(image_path)
                 except Exception as e:
@@ -49,3 +60,11 @@ def extract_images(input_file: Path, output_folder: Path) -> list[Path]:
                 img_index += 1
 
     return written
+
+
+def _save_as_png(fitz: Any, pdf_document: Any, xref: int, image_path: Path) -> None:
+    pix = fitz.Pixmap(pdf_document, xref)
+    # PNG holds grey and RGB only; CMYK and other colour spaces need converting first.
+    if pix.n - pix.alpha > 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    image_path.write_bytes(pix.tobytes("png"))
@@ -4,6 +4,8 @@ Extra: ``pdfplumber``. Markdown output infers headings from relative font size
 and renders extracted tables as markdown tables.
 """
 
+import statistics
+from collections.abc import Iterator
 from pathlib import Path
 
 from pdf_converter.backends.base import require, warn_unused_options
@@ -13,6 +15,29 @@ EXTRA = "pdfplumber"
 
 _HEADING_SIZE_RATIO = 1.2
 _DEFAULT_FONT_SIZE = 12
+# Heading words whose tops differ by at most this many points are on the same line.
+_LINE_TOLERANCE = 3
+
+
+def _render_words(words: list[dict], avg_font_size: float) -> Iterator[str]:
+    """Render a page's words, joining consecutive heading-sized words on one line into one heading."""
+    heading: list[str] = []
+    heading_top = 0.0
+    for word in words:
+        if word.get("size", avg_font_size) > avg_font_size * _HEADING_SIZE_RATIO:
+            if heading and abs(word["top"] - heading_top) > _LINE_TOLERANCE:
+                yield f"\n# {' '.join(heading)}\n"
+                heading = []
+            if not heading:
+                heading_top = word["top"]
+            heading.append(word["text"])
+            continue
+        if heading:
+            yield f"\n# {' '.join(heading)}\n"
+            heading = []
+        yield word["text"]
+    if heading:
+        yield f"\n# {' '.join(heading)}\n"
 
 
 def _render_table(table: list[list[str | None]]) -> list[str]:
@@ -42,29 +67,41 @@ def to_markdown(input_file: Path, **options) -> str:
     structured_text: list[str] = []
     with pdfplumber.open(input_file) as pdf:
         for page in pdf.pages:
-            char_data = page.objects.get("char", [])
-            font_sizes = [char["size"] for char in char_data if "size" in char]
-            avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else _DEFAULT_FONT_SIZE
-            size_by_text: dict[str, float] = {}
-            for char in char_data:
-                if "size" in char and char["text"] not in size_by_text:
-                    size_by_text[char["text"]] = char["size"]
-
-            for word in page.extract_words():
-                text = word["text"]
-                word_font_size = size_by_text.get(text, avg_font_size)
-                if word_font_size > avg_font_size * _HEADING_SIZE_RATIO:
-                    structured_text.append(f"\n# {text}\n")
-                else:
-                    structured_text.append(text)
+            font_sizes = [char["size"] for char in page.chars if "size" in char]
+            avg_font_size = statistics.fmean(font_sizes) if font_sizes else _DEFAULT_FONT_SIZE
+
+            # With extra_attrs, words are also split where the font size changes and
+            # each word carries the size of its own characters.
+            structured_text.extend(_render_words(page.extract_words(extra_attrs=["size"]), avg_font_size))
 
             for table in page.extract_tables():
                 structured_text.extend(_render_table(table))
 
             structured_text.append("\n---\n")
+            page.close()
     return "\n".join(structured_text)
 
 
+def iter_text(input_file: Path) -> Iterator[str]:
+    """Yield the plain text of a PDF page by page.
+
+    Args:
+        input_file: PDF to read.
+
+    Yields:
+        The text of each page.
+    """
+    pdfplumber = require("pdfplumber", backend=NAME, extra=EXTRA)
+
+    with pdfplumber.open(input_file) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            # Pages cache their parsed layout objects until the PDF is closed;
+            # release them as we go so memory stays flat on long documents.
+            page.close()
+            yield text
+
+
 def to_text(input_file: Path) -> str:
     """Extract plain text from a PDF, one page after another.
 
@@ -74,7 +111,4 @@ def to_text(input_file: Path) -> str:
     Returns:
         The document text.
     """
-    pdfplumber = require("pdfplumber", backend=NAME, extra=EXTRA)
-
-    with pdfplumber.open(input_file) as pdf:
-        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+    return "\n".join(iter_text(input_file))
@@ -4,7 +4,8 @@ Extra: ``pymupdf``. Markdown output uses a font-size heuristic to infer headings
 text output is a plain per-page text dump.
 """
 
-import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -21,12 +22,28 @@ _HEADING_MAX_LENGTH = 80
 _SENTENCE_ENDINGS = (".", ",", ";", ":", "?", "!")
 
 
-def _collect_text_blocks(doc: Any) -> list[dict[str, Any]]:
-    """Flatten a PyMuPDF document into per-line blocks with formatting hints."""
-    text_blocks: list[dict[str, Any]] = []
-    for page_num in range(len(doc)):
+class _BoldFonts(dict[str, bool]):
+    """Font name -> whether it names a bold face, worked out once per name.
+
+    A document uses a handful of fonts across thousands of spans, so this saves
+    lower-casing and searching the font name for every span.
+    """
+
+    def __missing__(self, font: str) -> bool:
+        is_bold = self[font] = "bold" in font.lower()
+        return is_bold
+
+
+def _iter_text_blocks(doc: Any, start: int = 0, stop: int | None = None) -> Iterator[dict[str, Any]]:
+    """Yield pages ``start:stop`` of a PyMuPDF document as per-line blocks with formatting hints."""
+    fitz = require("fitz", backend=NAME, extra=EXTRA)
+    # The "dict" defaults include every image on the page, with its decoded pixels, as a
+    # block of its own; only the text blocks are used here.
+    flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+    bold_fonts = _BoldFonts()
+    for page_num in range(start, len(doc) if stop is None else stop):
         page = doc[page_num]
-        blocks = page.get_text("dict")["blocks"]
+        blocks = page.get_text("dict", flags=flags)["blocks"]
 
         for block in blocks:
             if "lines" not in block:
@@ -35,70 +52,87 @@ def _collect_text_blocks(doc: Any) -> list[dict[str, Any]]:
                 if "spans" not in line:
                     continue
 
-                line_text = ""
-                is_bold = False
-                font_size = 0
-
-                for span in line["spans"]:
-                    if not span["text"].strip():
-                        continue
-                    font_size = max(font_size, span["size"])
-                    if "bold" in span["font"].lower() or span["flags"] & 2:
-                        is_bold = True
-                    line_text += span["text"]
-
-                if line_text.strip():
-                    text_blocks.append(
-                        {
-                            "text": line_text.strip(),
-                            "is_bold": is_bold,
-                            "is_heading": font_size > _HEADING_MIN_SIZE,
-                            "font_size": font_size,
-                            "page": page_num + 1,
-                        }
-                    )
-    return text_blocks
-
-
-def _render_markdown(text_blocks: list[dict[str, Any]]) -> str:
-    """Render collected text blocks as markdown."""
-    md_lines: list[str] = []
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                line_text = "".join(span["text"] for span in spans).strip()
+                font_size = max(span["size"] for span in spans)
+                yield {
+                    "text": line_text,
+                    "is_bold": any(span["flags"] & 2 or bold_fonts[span["font"]] for span in spans),
+                    "is_heading": font_size > _HEADING_MIN_SIZE,
+                    "font_size": font_size,
+                    "page": page_num + 1,
+                }
+
+
+def _collect_page_range(input_file: Path, start: int, stop: int) -> list[dict[str, Any]]:
+    """Worker for ``page_workers``: open the PDF in this process and collect one page range."""
+    fitz = require("fitz", backend=NAME, extra=EXTRA)
+    with fitz.open(input_file) as doc:
+        return list(_iter_text_blocks(doc, start, stop))
+
+
+def _collect_text_blocks_parallel(input_file: Path, page_count: int, workers: int) -> list[dict[str, Any]]:
+    """Collect blocks with one contiguous page range per worker process, in page order."""
+    workers = min(workers, page_count)
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        ranges = executor.map(_collect_page_range, [input_file] * workers, bounds[:-1], bounds[1:])
+        return [block for blocks in ranges for block in blocks]
+
+
+def _render_markdown(text_blocks: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Render text blocks as markdown, yielding it piece by piece.
+
+    Lines are separated by one blank line and page breaks by a ``---`` rule
+    surrounded by blank lines, so the pieces never need a clean-up pass.
+    """
     prev_block: dict[str, Any] | None = None
+    ends_with_rule = False
 
     for block in text_blocks:
         text = block["text"].strip()
         if not text:
             continue
 
+        if prev_block is not None:
+            yield "\n\n"
+
         looks_like_title = len(text) < _HEADING_MAX_LENGTH and not text.endswith(_SENTENCE_ENDINGS)
         if block["is_heading"] or looks_like_title:
             if block["font_size"] >= _H1_MIN_SIZE:
-                md_lines.append(f"# {text}")
+                yield f"# {text}"
             elif block["font_size"] >= _H2_MIN_SIZE:
-                md_lines.append(f"## {text}")
+                yield f"## {text}"
             elif block["font_size"] >= _H3_MIN_SIZE:
-                md_lines.append(f"### {text}")
+                yield f"### {text}"
             elif block["is_bold"]:
-                md_lines.append(f"**{text}**")
+                yield f"**{text}**"
             else:
-                md_lines.append(text)
+                yield text
         elif block["is_bold"]:
-            md_lines.append(f"**{text}**")
+            yield f"**{text}**"
         else:
-            md_lines.append(text)
+            yield text
 
-        if prev_block and prev_block["page"] != block["page"]:
-            md_lines.append("\n---\n")
+        ends_with_rule = prev_block is not None and prev_block["page"] != block["page"]
+        if ends_with_rule:
+            yield "\n\n---"
         prev_block = block
 
-    return re.sub(r"\n{3,}", "\n\n", "\n\n".join(md_lines))
+    if ends_with_rule:
+        yield "\n"
 
 
-def to_markdown(input_file: Path, **options) -> str:
+def to_markdown(input_file: Path, page_workers: int = 1, **options) -> str:
     """Convert a PDF to markdown using PyMuPDF text extraction plus heuristics.
 
     Args:
         input_file: PDF to convert.
+        page_workers: Number of processes that extract pages in parallel. Each one
+            opens the PDF and handles a contiguous page range, so this only pays
+            off for long documents. Default 1 extracts in this process.
         **options: Ignored.
 
     Returns:
@@ -108,7 +142,26 @@ def to_markdown(input_file: Path, **options) -> str:
     fitz = require("fitz", backend=NAME, extra=EXTRA)
 
     with fitz.open(input_file) as doc:
-        return _render_markdown(_collect_text_blocks(doc))
+        page_count = len(doc)
+        if page_workers <= 1 or page_count <= 1:
+            return "".join(_render_markdown(_iter_text_blocks(doc)))
+    return "".join(_render_markdown(_collect_text_blocks_parallel(input_file, page_count, page_workers)))
+
+
+def iter_text(input_file: Path) -> Iterator[str]:
+    """Yield the plain text of a PDF page by page.
+
+    Args:
+        input_file: PDF to read.
+
+    Yields:
+        The text of each page.
+    """
+    fitz = require("fitz", backend=NAME, extra=EXTRA)
+
+    with fitz.open(input_file) as doc:
+        for page in doc:
+            yield page.get_text()
 
 
 def to_text(input_file: Path) -> str:
@@ -120,7 +173,4 @@ def to_text(input_file: Path) -> str:
     Returns:
         The document text.
     """
-    fitz = require("fitz", backend=NAME, extra=EXTRA)
-
-    with fitz.open(input_file) as doc:
-        return "\n".join(page.get_text() for page in doc)
+    return "\n".join(iter_text(input_file))
@@ -0,0 +1,1088 @@
+"""Bulk conversion of PDFs referenced in a DataFrame into a zip archive.
+
+Re-exported lazily from :mod:`pdf_converter`, so ``from pdf_converter import
+create_markdown_from_column`` keeps working without every import of the
+package paying for pandas and requests.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from urllib3.util.retry import Retry
+
+from pdf_converter import backends
+from pdf_converter.cache import VALIDATOR_HEADERS, ConversionCache
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CONVERT_SCRIPT_MD = SCRIPT_DIR / "convert_single_pdf2md.py"
+CONVERT_SCRIPT_TXT = SCRIPT_DIR / "convert_single_pdf2txt.py"
+
+DEFAULT_DOCUMENT_TIMEOUT_SECONDS = 3600
+DEFAULT_CONVERSION_TIMEOUT_SECONDS = DEFAULT_DOCUMENT_TIMEOUT_SECONDS + 300
+DOWNLOAD_TIMEOUT_SECONDS = 60
+DOWNLOAD_CONNECT_TIMEOUT_SECONDS = 10
+# Every zip write copies the archive (and, for replacements, recompresses every member), so
+# converted files are buffered and written in batches of this size, or once the oldest
+# buffered file has waited ZIP_FLUSH_INTERVAL_SECONDS, whichever comes first.
+ZIP_WRITE_BATCH_SIZE = 50
+ZIP_FLUSH_INTERVAL_SECONDS = 60
+# Markdown and text compress well even at the fastest deflate level, which costs far less CPU than the default 6.
+ZIP_COMPRESSLEVEL = 1
+
+_ZIP_COPY_CHUNK_SIZE = 1 << 20
+# ZipInfo's deflate level; without it, members opened for writing by ZipInfo use zlib's default 6.
+_ZIPINFO_LEVEL_ATTR = "compress_level" if sys.version_info >= (3, 13) else "_compresslevel"
+
+_FATAL_CONVERSION_ERRORS = (backends.MissingBackendDependency, backends.UnknownBackend)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^a-zA-Z0-9_\-.]")
+_HTTP_SCHEMES = frozenset({"http", "https"})
+
+# Keep at least as many pooled connections per host as parallel workers are typically used.
+_HTTP_POOL_CONNECTIONS = 16
+_HTTP_POOL_MAXSIZE = 32
+_HTTP_RETRY_STATUS_CODES = (502, 503, 504)
+
+_session_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def safe_filename(name):
+    if not isinstance(name, str):
+        name = str(name)
+    return _UNSAFE_FILENAME_CHARS.sub("_", name)
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _write_zip_atomically(zip_path: Path, write: Callable[[Path], None]) -> None:
+    """Let ``write`` build the new archive in a temp file, then move it over ``zip_path``.
+
+    The zip itself is never opened for writing, so a run killed mid-write (or a
+    full disk) leaves it as it was after the last completed write.
+    """
+    # A unique temp file next to the zip: the final rename stays on one filesystem
+    # (so it is atomic), and concurrent or crashed runs cannot collide on its name.
+    fd, temp_name = tempfile.mkstemp(prefix=".zip_", suffix=".tmp", dir=Path(zip_path).parent)
+    os.close(fd)
+    temp_zip_path = Path(temp_name)
+    try:
+        write(temp_zip_path)
+        # mkstemp creates the file as 0600, and os.replace would carry that over to the zip.
+        try:
+            shutil.copymode(zip_path, temp_zip_path)
+        except FileNotFoundError:
+            os.chmod(temp_zip_path, 0o666 & ~_current_umask())
+        os.replace(temp_zip_path, zip_path)
+    finally:
+        temp_zip_path.unlink(missing_ok=True)
+
+
+def replace_in_zip(zip_path, filename, content):
+    replace_entries_in_zip(zip_path, {filename: content})
+
+
+def replace_entries_in_zip(
+    zip_path: Path,
+    entries: dict[str, str | bytes],
+    compresslevel: int = ZIP_COMPRESSLEVEL,
+) -> None:
+    """Rewrite the zip once, replacing (or adding) every entry in ``entries``.
+
+    Zip members cannot be replaced in place, so each call copies all other
+    members into a new archive. Batch replacements into one call rather than
+    calling this once per file.
+
+    Args:
+        zip_path: Zip to rewrite.
+        entries: New content by member name.
+        compresslevel: Deflate level (0-9) for the written members.
+    """
+
+    def write(temp_zip_path: Path) -> None:
+        with (
+            zipfile.ZipFile(zip_path, "r") as zf_in,
+            zipfile.ZipFile(
+                temp_zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+            ) as zf_out,
+        ):
+            for item in zf_in.infolist():
+                if item.filename in entries:
+                    continue
+                # Keep the member's timestamp, permissions and compression method; opening by name would
+                # reset them. Deflated members are written at this archive's compresslevel.
+                target = zipfile.ZipInfo(item.filename, item.date_time)
+                target.external_attr = item.external_attr
+                target.compress_type = item.compress_type
+                target.comment = item.comment
+                setattr(target, _ZIPINFO_LEVEL_ATTR, compresslevel)
+                # Stream each member across instead of holding it in memory as one bytes object.
+                with (
+                    zf_in.open(item) as src,
+                    zf_out.open(target, "w", force_zip64=item.file_size >= zipfile.ZIP64_LIMIT) as dst,
+                ):
+                    shutil.copyfileobj(src, dst, _ZIP_COPY_CHUNK_SIZE)
+            for filename, content in entries.items():
+                zf_out.writestr(filename, content)
+
+    _write_zip_atomically(zip_path, write)
+
+
+def append_to_zip(
+    zip_path: Path,
+    filename: str,
+    content: str | bytes,
+    compresslevel: int = ZIP_COMPRESSLEVEL,
+) -> None:
+    append_entries_to_zip(zip_path, {filename: content}, compresslevel)
+
+
+def append_entries_to_zip(
+    zip_path: Path,
+    entries: dict[str, str | bytes],
+    compresslevel: int = ZIP_COMPRESSLEVEL,
+) -> None:
+    """Add new entries to the zip without recompressing the existing members.
+
+    The entries are appended to a byte copy of the zip that then replaces it,
+    because appending in place overwrites the central directory first and a run
+    killed mid-append would leave the whole archive unreadable.
+
+    None of the names may be in the zip yet; use :func:`replace_entries_in_zip`
+    to overwrite existing entries.
+
+    Args:
+        zip_path: Zip to append to.
+        entries: Content by member name.
+        compresslevel: Deflate level (0-9) for the written members.
+    """
+
+    def write(temp_zip_path: Path) -> None:
+        shutil.copyfile(zip_path, temp_zip_path)
+        with zipfile.ZipFile(temp_zip_path, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+            for filename, content in entries.items():
+                zf.writestr(filename, content)
+
+    _write_zip_atomically(zip_path, write)
+
+
+def _entry_signature(data: bytes) -> tuple[int, int]:
+    """CRC-32 and size of a member's content, as stored in the zip's central directory."""
+    return zlib.crc32(data), len(data)
+
+
+def _ensure_zip(zip_path: Path) -> dict[str, tuple[int, int]]:
+    """Make sure zip exists; return the existing names with their (CRC-32, size)."""
+    if Path(zip_path).exists():
+        with zipfile.ZipFile(zip_path, mode="r") as zf:
+            return {info.filename: (info.CRC, info.file_size) for info in zf.infolist()}
+    logging.warning(f"ZIP {zip_path} does not exist. Creating a new one.")
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, mode="w"):
+        pass
+    return {}
+
+
+def _is_http_url(url: object) -> bool:
+    """Cheap sanity check so malformed URLs fail immediately instead of going through a download.
+
+    Only the scheme and host are checked: anything else, such as spaces in the
+    path, is percent-encoded by requests.
+    """
+    if not isinstance(url, str):
+        return False
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return False
+    return parsed.scheme.lower() in _HTTP_SCHEMES and bool(parsed.netloc)
+
+
+def _invalid_url_reason(pdf_url: str) -> str | None:
+    """Return why ``pdf_url`` cannot be downloaded, or None if it looks like an http(s) URL."""
+    if _is_http_url(pdf_url):
+        return None
+    return f"Invalid PDF URL: {pdf_url!r}"
+
+
+def _build_filenames(series: pd.Series, suffix: str) -> pd.Series:
+    return series.astype(str).str.replace(_UNSAFE_FILENAME_CHARS, "_", regex=True) + suffix
+
+
+def _failures_path(zip_path: Path) -> Path:
+    """Path to the failure-count JSON stored next to the output zip."""
+    return Path(zip_path).with_name(f"{Path(zip_path).stem}.failures.json")
+
+
+def _load_failures(zip_path: Path) -> dict[str, int]:
+    path = _failures_path(zip_path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            logging.warning(f"Ignoring invalid failure store {path}: expected a JSON object")
+            return {}
+        return {str(k): int(v) for k, v in data.items()}
+    except (OSError, json.JSONDecodeError, TypeError, ValueError) as e:
+        logging.warning(f"Could not load failure counts from {path}: {e}")
+        return {}
+
+
+def _save_failures(zip_path: Path, failures: dict[str, int]) -> None:
+    path = _failures_path(zip_path)
+    if not failures:
+        if path.exists():
+            path.unlink()
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(failures, f, indent=2, sort_keys=True)
+
+
+def _record_failure(
+    failures: dict[str, int],
+    zip_path: Path,
+    filename: str,
+    max_failures: int,
+    reason: str | None = None,
+) -> None:
+    count = failures.get(filename, 0) + 1
+    failures[filename] = count
+    if reason:
+        logging.warning(f"Conversion failed for {filename}: {count}/{max_failures} — {reason}")
+    else:
+        logging.warning(f"Conversion failed for {filename}: {count}/{max_failures}")
+    _save_failures(zip_path, failures)
+
+
+def _clear_failure(failures: dict[str, int], zip_path: Path, filename: str) -> None:
+    if filename not in failures:
+        return
+    del failures[filename]
+    _save_failures(zip_path, failures)
+
+
+def _prepare_batch_rows(
+    df: pd.DataFrame,
+    name_column: str,
+    url_column: str,
+    suffix: str,
+    existing: dict[str, tuple[int, int]],
+    replace_all: bool,
+    failures: dict[str, int],
+    max_failures: int | None,
+    shuffle: bool,
+) -> pd.DataFrame:
+    names = df[name_column]
+    urls = df[url_column]
+    filenames = _build_filenames(names, suffix)
+
+    mask = names.notna() & urls.notna() & (urls.astype(str).str.len() > 0)
+    invalid_urls = mask & ~urls.astype(str).map(_is_http_url)
+    for filename, url in zip(filenames[invalid_urls], urls[invalid_urls]):
+        logging.warning(f"Skipping {filename}: invalid PDF URL {url!r}")
+    mask &= ~invalid_urls
+    if not replace_all:
+        mask &= ~filenames.isin(existing)
+
+    if max_failures is not None:
+        for name in [n for n in failures if n in existing]:
+            del failures[name]
+
+        exhausted = {name for name, count in failures.items() if count >= max_failures}
+        if exhausted:
+            skipped = mask & filenames.isin(exhausted)
+            for filename in filenames[skipped].unique():
+                count = failures[filename]
+                logging.info(f"Skipping {filename}: reached max failures ({count}/{max_failures})")
+            mask &= ~skipped
+
+    valid = pd.DataFrame({url_column: urls[mask], "__filename": filenames[mask]})
+    valid = valid[~valid["__filename"].duplicated()]
+
+    if shuffle and not valid.empty:
+        valid = valid.sample(frac=1).reset_index(drop=True)
+
+    return valid
+
+
+class _ZipWriter:
+    """Buffer converted files and write them to the output zip in batches.
+
+    New files are appended; files that already exist in the zip are replaced
+    in one rewrite per batch, unless the new content is byte-identical to the
+    stored member (same CRC-32 and size), in which case the rewrite is skipped.
+    Every write goes through a temp file that replaces the zip, and failure
+    counts are cleared only once a file is actually in the zip, so a crash
+    before or during a flush just means the buffered documents are converted
+    again on the next run.
+    """
+
+    def __init__(
+        self,
+        zip_path: Path,
+        existing: dict[str, tuple[int, int]],
+        failures: dict[str, int],
+        max_failures: int | None,
+        label: str,
+    ):
+        self.zip_path = zip_path
+        self.existing = existing
+        self.failures = failures
+        self.max_failures = max_failures
+        self.label = label
+        self._new: dict[str, bytes] = {}
+        self._replaced: dict[str, bytes] = {}
+        self._oldest: float | None = None
+        self.written: set[str] = set()
+
+    def add(self, filename: str, content: str) -> None:
+        """Buffer ``content``; flush when the batch is full or has waited too long."""
+        data = content.encode("utf-8")
+        if filename in self.existing:
+            if self.existing[filename] == _entry_signature(data):
+                # Deterministic converters often reproduce the stored file exactly.
+                self._replaced.pop(filename, None)
+                if self.max_failures is not None:
+                    _clear_failure(self.failures, self.zip_path, filename)
+                tqdm.write(f"{self.label} unchanged: {filename}")
+                self.flush_if_due()
+                return
+            self._replaced[filename] = data
+        else:
+            self._new[filename] = data
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if len(self._new) + len(self._replaced) >= ZIP_WRITE_BATCH_SIZE:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """Flush once the oldest buffered file has waited ZIP_FLUSH_INTERVAL_SECONDS.
+
+        Called for every result, not only for files that are buffered, so a run of
+        failed or unchanged documents does not hold earlier conversions back.
+        """
+        if self._oldest is not None and time.monotonic() - self._oldest >= ZIP_FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered file to the zip."""
+        self._write(self._new, append_entries_to_zip, "created")
+        self._write(self._replaced, replace_entries_in_zip, "replaced")
+        self._oldest = None
+
+    def _write(
+        self,
+        entries: dict[str, bytes],
+        write: Callable[[Path, dict[str, str | bytes]], None],
+        verb: str,
+    ) -> None:
+        if not entries:
+            return
+        try:
+            write(self.zip_path, entries)
+        except Exception as e:
+            logging.error(f"⚠️ Failed to write {len(entries)} files to ZIP: {e}")
+            if self.max_failures is not None:
+                for filename in entries:
+                    _record_failure(self.failures, self.zip_path, filename, self.max_failures, reason=str(e))
+        else:
+            self.written.update(entries)
+            for filename, data in entries.items():
+                self.existing[filename] = _entry_signature(data)
+                if self.max_failures is not None:
+                    _clear_failure(self.failures, self.zip_path, filename)
+                tqdm.write(f"{self.label} {verb}: {filename}")
+        entries.clear()
+
+
+def _handle_conversion_result(
+    content: str,
+    filename: str,
+    writer: _ZipWriter,
+    failures: dict[str, int],
+    max_failures: int | None,
+    failure_reason: str | None = None,
+) -> bool:
+    """Queue successful content for the zip; update failure counts. Returns True if queued.
+
+    Success is decided by ``failure_reason``, not by content length: a document
+    that legitimately converts to nothing is written as an empty file so it is
+    not retried on every subsequent run.
+    """
+    if failure_reason is None:
+        if not content.strip():
+            logging.warning(f"{filename}: conversion succeeded but produced no content")
+        writer.add(filename, content)
+        return True
+
+    if max_failures is not None:
+        _record_failure(failures, writer.zip_path, filename, max_failures, reason=failure_reason)
+    writer.flush_if_due()
+    return False
+
+
+def _run_batch_conversions(
+    rows: Iterable[tuple[str, str]],
+    convert_fn: Callable[..., tuple[str, str | None]],
+    method: str,
+    zip_path: Path,
+    existing: dict[str, tuple[int, int]],
+    failures: dict[str, int],
+    max_failures: int | None,
+    max_workers: int,
+    label: str,
+    conversion_timeout: float = DEFAULT_CONVERSION_TIMEOUT_SECONDS,
+    cache_dir: Path | None = None,
+) -> set[str]:
+    """Convert rows; write to zip and update failures on the main thread.
+
+    Rows that share a URL are converted once and the result is written under
+    each of their filenames.
+
+    Returns:
+        The names of the zip members that were created or replaced.
+    """
+    filenames_by_url: dict[str, list[str]] = {}
+    for url, filename in rows:
+        filenames_by_url.setdefault(url, []).append(filename)
+    if not filenames_by_url:
+        return set()
+
+    total = sum(len(filenames) for filenames in filenames_by_url.values())
+    progress_bar = tqdm(total=total, desc=f"{label} ({method})", dynamic_ncols=True)
+    workers = max(1, max_workers)
+    writer = _ZipWriter(zip_path, existing, failures, max_failures, label)
+
+    def _convert(url: str) -> tuple[str, str | None]:
+        return convert_fn(url, method, conversion_timeout=conversion_timeout, cache_dir=cache_dir)
+
+    def _handle(filenames: list[str], content: str, failure_reason: str | None) -> None:
+        for filename in filenames:
+            _handle_conversion_result(content, filename, writer, failures, max_failures, failure_reason)
+            progress_bar.update(1)
+
+    try:
+        if workers == 1:
+            for url, filenames in filenames_by_url.items():
+                _handle(filenames, *_convert(url))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_url = {executor.submit(_convert, url): url for url in filenames_by_url}
+                for future in as_completed(future_to_url):
+                    url = future_to_url[future]
+                    try:
+                        content, failure_reason = future.result()
+                    except _FATAL_CONVERSION_ERRORS:
+                        for pending in future_to_url:
+                            pending.cancel()
+                        raise
+                    except Exception as e:
+                        logging.error(f"Unexpected conversion error for {url}: {e}")
+                        content, failure_reason = "", str(e)
+                    _handle(filenames_by_url[url], content, failure_reason)
+    finally:
+        # Also on a fatal error: conversions that already finished are kept.
+        writer.flush()
+        progress_bar.close()
+    return writer.written
+
+
+def _convert_column(
+    df: pd.DataFrame,
+    url_column: str,
+    name_column: str,
+    method: str,
+    zip_path: Path,
+    suffix: str,
+    convert_fn: Callable[..., tuple[str, str | None]],
+    label: str,
+    *,
+    replace_all: bool,
+    max_failures: int | None,
+    shuffle: bool,
+    max_workers: int,
+    conversion_timeout: float,
+    cache_dir: Path | None,
+) -> None:
+    """Shared body of :func:`create_markdown_from_column` and :func:`create_text_from_column`."""
+    zip_path = Path(zip_path)
+    existing = _ensure_zip(zip_path)
+    failures = _load_failures(zip_path) if max_failures is not None else {}
+
+    valid = _prepare_batch_rows(
+        df,
+        name_column,
+        url_column,
+        suffix,
+        existing,
+        replace_all,
+        failures,
+        max_failures,
+        shuffle,
+    )
+    if max_failures is not None:
+        _save_failures(zip_path, failures)
+
+    if valid.empty:
+        logging.info(f"Nothing to do: all {label} files already present.")
+        return
+
+    written = _run_batch_conversions(
+        valid[[url_column, "__filename"]].itertuples(index=False, name=None),
+        convert_fn,
+        method,
+        zip_path,
+        existing,
+        failures,
+        max_failures,
+        max_workers,
+        label,
+        conversion_timeout=conversion_timeout,
+        cache_dir=cache_dir,
+    )
+    logging.info(f"Processed {len(valid)} rows for {label} conversion using '{method}'")
+
+    # Only the members written in this run can differ from the extracted copies;
+    # everything else is extracted only if it is missing.
+    target_dir = zip_path.with_suffix("")
+    logging.info(f"Unzipping {len(written)} new or replaced files from {zip_path} to {target_dir}")
+    unzip_to_folder(zip_path, target_dir, overwrite=True, only=written)
+    unzip_to_folder(zip_path, target_dir)
+
+
+def unzip_to_folder(
+    zip_path: Path,
+    target_dir: Path,
+    overwrite: bool = False,
+    only: Iterable[str] | None = None,
+):
+    """
+    Extracts a ZIP to a normal folder.
+
+    Args:
+        zip_path (Path): Path to the ZIP file.
+        target_dir (Path): Directory where contents will be extracted.
+        overwrite (bool): If True, overwrite existing files.
+        only (Iterable[str], optional): Extract just these members; names that are
+            not in the zip are ignored. Defaults to every member.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        members = zf.namelist()
+        if only is not None:
+            wanted = set(only)
+            members = [member for member in members if member in wanted]
+        for member in members:
+            target_file = target_dir / member
+            if not overwrite and target_file.exists():
+                continue
+            zf.extract(member, target_dir)
+
+
+def _get_session() -> requests.Session:
+    """Return the process-wide download session (created once).
+
+    Reusing one session keeps connections alive between downloads, so batches
+    from the same host skip a TCP and TLS handshake per PDF.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=_HTTP_RETRY_STATUS_CODES)
+            adapter = HTTPAdapter(
+                pool_connections=_HTTP_POOL_CONNECTIONS,
+                pool_maxsize=_HTTP_POOL_MAXSIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _stream_pdf(
+    pdf_url: str,
+    consume: Callable[[Iterable[bytes]], object],
+    validators: dict[str, str] | None = None,
+) -> str | None:
+    """Download a PDF and pass its chunks to ``consume``. Returns a failure reason, or None on success.
+
+    If ``validators`` is given, the response's ``ETag`` / ``Last-Modified`` headers are stored in it.
+    """
+    logging.info(f"Downloading PDF: {pdf_url}")
+    timeout = (DOWNLOAD_CONNECT_TIMEOUT_SECONDS, DOWNLOAD_TIMEOUT_SECONDS)
+    try:
+        with _get_session().get(pdf_url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            consume(response.iter_content(chunk_size=1 << 16))
+            if validators is not None:
+                validators.update(
+                    {name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers}
+                )
+    except Exception as e:
+        reason = f"Failed to download PDF: {e}"
+        logging.error(reason)
+        return reason
+    return None
+
+
+def _download_pdf(pdf_url: str, pdf_path: Path, validators: dict[str, str] | None = None) -> str | None:
+    """Stream a PDF to ``pdf_path``. Returns a failure reason, or None on success."""
+
+    def _write(chunks: Iterable[bytes]) -> None:
+        with open(pdf_path, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+    return _stream_pdf(pdf_url, _write, validators)
+
+
+def _download_pdf_bytes(pdf_url: str, validators: dict[str, str] | None = None) -> tuple[bytes, str | None]:
+    """Download a PDF into memory. Returns ``(content, failure_reason)``."""
+    chunks: list[bytes] = []
+    reason = _stream_pdf(pdf_url, chunks.extend, validators)
+    return (b"", reason) if reason is not None else (b"".join(chunks), None)
+
+
+def _changed_since(pdf_url: str, validators: dict[str, str]) -> bool:
+    """Ask the server with a conditional GET whether the PDF changed since ``validators`` were stored.
+
+    Without validators there is nothing to compare, so the PDF counts as unchanged.
+    Only a 2xx response means the PDF changed; if the server cannot be reached or
+    answers with an error, the cached conversion is used rather than failing.
+    """
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    if not headers:
+        return False
+    timeout = (DOWNLOAD_CONNECT_TIMEOUT_SECONDS, DOWNLOAD_TIMEOUT_SECONDS)
+    try:
+        with _get_session().get(pdf_url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304:
+                return False
+            if 200 <= response.status_code < 300:
+                return True
+            logging.warning(
+                f"Could not revalidate cached conversion of {pdf_url}, using it anyway: HTTP {response.status_code}"
+            )
+            return False
+    except Exception as e:
+        logging.warning(f"Could not revalidate cached conversion of {pdf_url}, using it anyway: {e}")
+        return False
+
+
+def _pdf_filename(pdf_url: str) -> str:
+    """Best-effort file name for a PDF URL, used to label in-memory uploads."""
+    return Path(urlparse(pdf_url).path).name or "document.pdf"
+
+
+def _run_conversion_subprocess(
+    script: Path,
+    pdf_path: Path,
+    method: str,
+    conversion_timeout: float,
+) -> tuple[str, str | None]:
+    """Run a conversion script in a subprocess for crash isolation.
+
+    The child writes its result to a temporary file that is read back here,
+    rather than streaming it through a pipe; its stdout is discarded, so
+    stray prints from backend libraries cannot end up in the content.
+
+    Returns:
+        A tuple of ``(content, failure_reason)`` for per-document outcomes.
+
+    Raises:
+        MissingBackendDependency: If the script reported a missing backend extra.
+        UnknownBackend: If the script reported an unknown method name.
+    """
+    fd, temp_name = tempfile.mkstemp(suffix=".out")
+    os.close(fd)
+    output_path = Path(temp_name)
+    try:
+        try:
+            result = subprocess.run(
+                [sys.executable, str(script), str(pdf_path), method, str(output_path)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=conversion_timeout,
+            )
+        except subprocess.TimeoutExpired:
+            reason = f"Conversion timed out after {conversion_timeout}s"
+            logging.error(reason)
+            return "", reason
+        except Exception as e:
+            reason = f"Unexpected error in subprocess: {e}"
+            logging.error(reason)
+            return "", reason
+
+        if result.returncode != 0:
+            reason = (result.stderr or "subprocess failed with no output").strip()
+            if result.returncode == backends.EXIT_MISSING_DEPENDENCY:
+                raise backends.MissingBackendDependency(reason)
+            if result.returncode == backends.EXIT_UNKNOWN_BACKEND:
+                raise backends.UnknownBackend(reason)
+            logging.error(f"[ERROR] Subprocess failed: {reason}")
+            return "", reason
+        try:
+            return output_path.read_bytes().decode("utf-8"), None
+        except (OSError, UnicodeDecodeError) as e:
+            reason = f"Could not read conversion output: {e}"
+            logging.error(reason)
+            return "", reason
+    finally:
+        output_path.unlink(missing_ok=True)
+
+
+def _convert_remote(method: str, pdf_url: str, pdf_path: Path | None = None, **options) -> tuple[str, str | None]:
+    """Run a remote backend in-process. Returns ``(content, failure_reason)``."""
+    try:
+        return backends.convert_to_markdown(method, pdf_path, **options), None
+    except _FATAL_CONVERSION_ERRORS:
+        raise
+    except Exception as e:
+        reason = f"{method} conversion failed: {e}"
+        logging.error(f"[ERROR] {reason} ({pdf_url})")
+        return "", reason
+
+
+def _with_cache(
+    cache_dir: Path | None,
+    kind: str,
+    method: str,
+    pdf_url: str,
+    options: dict,
+    convert: Callable[[dict[str, str] | None], tuple[str, str | None]],
+) -> tuple[str, str | None]:
+    """Serve ``convert(validators)`` from the conversion cache when ``cache_dir`` is set.
+
+    A cached entry is revalidated with a conditional GET when the server sent
+    ``ETag`` / ``Last-Modified`` for it; ``convert`` fills ``validators`` with the
+    headers of the PDF it downloads.
+    """
+    if cache_dir is None:
+        return convert(None)
+    cache = ConversionCache(cache_dir)
+    cached = cache.get(kind, method, pdf_url, options)
+    if cached is not None and not _changed_since(pdf_url, cache.validators(kind, method, pdf_url, options)):
+        return cached, None
+    validators: dict[str, str] = {}
+    content, reason = convert(validators)
+    if reason is None:
+        cache.put(kind, method, pdf_url, content, options, validators)
+    return content, reason
+
+
+def convert_pdf_to_md(
+    pdf_url: str,
+    method: str,
+    pdf_path: Path | None = None,
+    *,
+    conversion_timeout: float = DEFAULT_CONVERSION_TIMEOUT_SECONDS,
+    cache_dir: Path | None = None,
+    **docling_options,
+) -> tuple[str, str | None]:
+    """
+    Downloads a PDF from a URL and converts it to Markdown using the specified conversion method.
+
+    Remote backends (see ``pdf_converter.backends.REMOTE_BACKENDS``, currently
+    ``docling-serve``) run in-process: the file is downloaded into memory (or to
+    ``pdf_path`` when given), then submitted as a base64 source job and polled
+    until done. Local backends run in a subprocess for crash isolation.
+
+    Args:
+        pdf_url (str): The URL of the PDF to download.
+        method (str): The conversion method to use (e.g. 'docling-serve', 'pymupdf4llm').
+        pdf_path (Path, optional): Path to save the downloaded PDF. If omitted, a unique
+            temporary file is created and removed after conversion; remote backends
+            keep the download in memory instead.
+        conversion_timeout: Max seconds for the conversion subprocess. Ignored by remote
+            backends, which use their own submit/poll/result timeouts.
+        cache_dir: If set, reuse a conversion of the same URL with the same method and
+            options from this directory instead of downloading again, and store
+            successful conversions there (see :mod:`pdf_converter.cache`). Entries with
+            an ``ETag`` / ``Last-Modified`` are revalidated with a conditional GET.
+        **docling_options: Extra options forwarded to the remote backend.
+
+    Returns:
+        A tuple of ``(markdown_content, failure_reason)``. On success, ``failure_reason``
+        is ``None``. On failure, content is empty and ``failure_reason`` explains why.
+
+    Raises:
+        UnknownBackend: If ``method`` is not a known markdown backend.
+        MissingBackendDependency: If the backend's extra is not installed.
+    """
+    backends.validate_method(method, "markdown")
+    reason = _invalid_url_reason(pdf_url)
+    if reason is not None:
+        logging.error(reason)
+        return "", reason
+    return _with_cache(
+        cache_dir,
+        "markdown",
+        method,
+        pdf_url,
+        docling_options,
+        lambda validators: _download_and_convert_md(
+            pdf_url, method, pdf_path, conversion_timeout, docling_options, validators
+        ),
+    )
+
+
+def _download_and_convert_md(
+    pdf_url: str,
+    method: str,
+    pdf_path: Path | None,
+    conversion_timeout: float,
+    docling_options: dict,
+    validators: dict[str, str] | None = None,
+) -> tuple[str, str | None]:
+    """Download and convert one PDF to Markdown, bypassing the cache."""
+    if backends.is_remote(method) and pdf_path is None:
+        # The remote backend uploads the PDF as base64 anyway, so keep it in
+        # memory instead of writing it to disk and reading it straight back.
+        pdf_bytes, reason = _download_pdf_bytes(pdf_url, validators)
+        if reason is not None:
+            return "", reason
+        return _convert_remote(
+            method, pdf_url, file_content=pdf_bytes, filename=_pdf_filename(pdf_url), **docling_options
+        )
+
+    own_temp = pdf_path is None
+    if own_temp:
+        fd, temp_name = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        pdf_path = Path(temp_name)
+
+    try:
+        reason = _download_pdf(pdf_url, pdf_path, validators)
+        if reason is not None:
+            return "", reason
+
+        if backends.is_remote(method):
+            return _convert_remote(method, pdf_url, pdf_path, **docling_options)
+
+        return _run_conversion_subprocess(CONVERT_SCRIPT_MD, pdf_path, method, conversion_timeout)
+    finally:
+        if own_temp and pdf_path is not None:
+            pdf_path.unlink(missing_ok=True)
+
+
+def create_markdown_from_column(
+    df: pd.DataFrame,
+    url_column: str,
+    method: str,
+    zip_path: Path,
+    md_name_column: str,
+    replace_all: bool = False,
+    max_failures: int | None = None,
+    shuffle: bool = False,
+    max_workers: int = 1,
+    conversion_timeout: float = DEFAULT_CONVERSION_TIMEOUT_SECONDS,
+    cache_dir: Path | None = None,
+):
+    """
+    Convert PDFs referenced in a DataFrame column to Markdown and store them in a zip.
+
+    Files already present in the zip are skipped unless ``replace_all`` is True.
+    Only successful conversions are written — but success is decided by the
+    backend, not by output length: a document that legitimately converts to
+    nothing is written as an empty file so it is not retried on every run.
+
+    Args:
+        df: Source DataFrame.
+        url_column: Column with PDF URLs.
+        method: Conversion backend name (passed to ``convert_pdf_to_md``).
+        zip_path: Output zip path. Failure counts are stored beside it as
+            ``{zip_stem}.failures.json`` when ``max_failures`` is set.
+        md_name_column: Column used to build output filenames.
+        replace_all: If True, re-convert even when the target already exists in the zip.
+        max_failures: If set, skip a filename after it has failed this many times across
+            runs (download, conversion or zip-write failure). ``None`` retries forever
+            (default). A later successful write clears the failure entry.
+        shuffle: If True, shuffle remaining work after filtering existing files and
+            exhausted failures. Helps with transient / rate-limit failures by trying
+            documents in a different order each run.
+        max_workers: Number of parallel conversions (default 1 = sequential). Useful for
+            ``docling-serve``; start with 2–4 and raise carefully.
+        conversion_timeout: Max seconds per conversion subprocess. Defaults to 1h plus
+            overhead so Docling Serve async polling can finish.
+        cache_dir: Optional conversion cache directory (see ``convert_pdf_to_md``).
+            Lets reruns with ``replace_all`` or other zips reuse earlier conversions.
+    """
+    _convert_column(
+        df,
+        url_column,
+        md_name_column,
+        method,
+        zip_path,
+        f"_{method}.md",
+        convert_pdf_to_md,
+        "Markdown",
+        replace_all=replace_all,
+        max_failures=max_failures,
+        shuffle=shuffle,
+        max_workers=max_workers,
+        conversion_timeout=conversion_timeout,
+        cache_dir=cache_dir,
+    )
+
+
+def convert_pdf_to_txt(
+    pdf_url: str,
+    method: str,
+    pdf_path: Path | None = None,
+    *,
+    conversion_timeout: float = DEFAULT_CONVERSION_TIMEOUT_SECONDS,
+    cache_dir: Path | None = None,
+) -> tuple[str, str | None]:
+    """
+    Downloads a PDF from a URL and converts it to plain text using the specified method.
+
+    Args:
+        pdf_url (str): The URL of the PDF to download.
+        method (str): The conversion method to use ('pymupdf', 'pdfplumber', etc.).
+        pdf_path (Path, optional): Path to save the downloaded PDF. If omitted, a unique
+            temporary file is created and removed after conversion.
+        conversion_timeout: Max seconds for the conversion subprocess.
+        cache_dir: If set, reuse a conversion of the same URL with the same method from
+            this directory instead of downloading again, and store successful
+            conversions there (see :mod:`pdf_converter.cache`). Entries with an
+            ``ETag`` / ``Last-Modified`` are revalidated with a conditional GET.
+
+    Returns:
+        A tuple of ``(text_content, failure_reason)``. On success, ``failure_reason`` is
+        ``None``. On failure, content is empty and ``failure_reason`` explains why.
+
+    Raises:
+        UnknownBackend: If ``method`` is not a known text backend. Markdown-only
+            backends such as ``docling-serve`` are rejected here.
+        MissingBackendDependency: If the backend's extra is not installed.
+    """
+    backends.validate_method(method, "text")
+    reason = _invalid_url_reason(pdf_url)
+    if reason is not None:
+        logging.error(reason)
+        return "", reason
+    return _with_cache(
+        cache_dir,
+        "text",
+        method,
+        pdf_url,
+        {},
+        lambda validators: _download_and_convert_txt(pdf_url, method, pdf_path, conversion_timeout, validators),
+    )
+
+
+def _download_and_convert_txt(
+    pdf_url: str,
+    method: str,
+    pdf_path: Path | None,
+    conversion_timeout: float,
+    validators: dict[str, str] | None = None,
+) -> tuple[str, str | None]:
+    """Download and convert one PDF to plain text, bypassing the cache."""
+    own_temp = pdf_path is None
+    if own_temp:
+        fd, temp_name = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        pdf_path = Path(temp_name)
+
+    try:
+        reason = _download_pdf(pdf_url, pdf_path, validators)
+        if reason is not None:
+            return "", reason
+
+        return _run_conversion_subprocess(CONVERT_SCRIPT_TXT, pdf_path, method, conversion_timeout)
+    finally:
+        if own_temp and pdf_path is not None:
+            pdf_path.unlink(missing_ok=True)
+
+
+def create_text_from_column(
+    df: pd.DataFrame,
+    url_column: str,
+    method: str,
+    zip_path: Path,
+    txt_name_column: str,
+    replace_all: bool = False,
+    max_failures: int | None = None,
+    shuffle: bool = False,
+    max_workers: int = 1,
+    conversion_timeout: float = DEFAULT_CONVERSION_TIMEOUT_SECONDS,
+    cache_dir: Path | None = None,
+):
+    """
+    Convert PDFs referenced in a DataFrame column to plain text and store them in a zip.
+
+    Files already present in the zip are skipped unless ``replace_all`` is True.
+    Only successful conversions are written — but success is decided by the
+    backend, not by output length: a document that legitimately converts to
+    nothing is written as an empty file so it is not retried on every run.
+
+    Args:
+        df: Source DataFrame.
+        url_column: Column with PDF URLs.
+        method: Conversion backend name (passed to ``convert_pdf_to_txt``).
+        zip_path: Output zip path. Failure counts are stored beside it as
+            ``{zip_stem}.failures.json`` when ``max_failures`` is set.
+        txt_name_column: Column used to build output filenames.
+        replace_all: If True, re-convert even when the target already exists in the zip.
+        max_failures: If set, skip a filename after it has failed this many times across
+            runs (download, conversion or zip-write failure). ``None`` retries forever
+            (default). A later successful write clears the failure entry.
+        shuffle: If True, shuffle remaining work after filtering existing files and
+            exhausted failures. Helps with transient / rate-limit failures by trying
+            documents in a different order each run.
+        max_workers: Number of parallel conversions (default 1 = sequential). Useful for
+            I/O-bound backends; start with 2–4 and raise carefully.
+        conversion_timeout: Max seconds per conversion subprocess.
+        cache_dir: Optional conversion cache directory (see ``convert_pdf_to_txt``).
+            Lets reruns with ``replace_all`` or other zips reuse earlier conversions.
+    """
+    _convert_column(
+        df,
+        url_column,
+        txt_name_column,
+        method,
+        zip_path,
+        f"_{method}.txt",
+        convert_pdf_to_txt,
+        "Text",
+        replace_all=replace_all,
+        max_failures=max_failures,
+        shuffle=shuffle,
+        max_workers=max_workers,
+        conversion_timeout=conversion_timeout,
+        cache_dir=cache_dir,
+    )
@@ -0,0 +1,106 @@
+"""On-disk cache of converted documents, keyed by source URL and method.
+
+Converting a PDF means downloading it and running a backend over it, which
+takes seconds to minutes. The cache stores each successful conversion under
+``sha256(kind | method | options | url)`` so reruns — and other output zips
+built from the same URLs — can reuse it without touching the network.
+
+Entries are plain UTF-8 files and are written atomically, so an interrupted
+run never leaves a truncated entry behind. Delete the directory to clear it.
+
+When the server sent ``ETag`` or ``Last-Modified`` with the PDF, they are
+stored in a ``.json`` file next to the entry, so the entry can be revalidated
+with a conditional GET instead of downloading the PDF again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SUFFIXES = {"markdown": ".md", "text": ".txt"}
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+class ConversionCache:
+    """Read and write converted documents under ``cache_dir``."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def path(self, kind: str, method: str, pdf_url: str, options: dict[str, Any] | None = None) -> Path:
+        """Return the entry path for a conversion.
+
+        Args:
+            kind: ``"markdown"`` or ``"text"``; the same backend can produce both.
+            method: Backend name.
+            pdf_url: Source URL of the PDF.
+            options: Backend options that change the output, if any.
+        """
+        options_key = json.dumps(options or {}, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{kind}|{method.lower()}|{options_key}|{pdf_url}".encode()).hexdigest()
+        return self.cache_dir / f"{key}{_SUFFIXES.get(kind, '')}"
+
+    def get(self, kind: str, method: str, pdf_url: str, options: dict[str, Any] | None = None) -> str | None:
+        """Return the cached content, or None on a miss."""
+        path = self.path(kind, method, pdf_url, options)
+        try:
+            content = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+        logger.info("Cache hit for %s (%s)", pdf_url, method)
+        return content
+
+    def validators(self, kind: str, method: str, pdf_url: str, options: dict[str, Any] | None = None) -> dict[str, str]:
+        """Return the stored ``ETag`` / ``Last-Modified`` headers of an entry, if any."""
+        path = self.path(kind, method, pdf_url, options).with_suffix(".json")
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache validators %s: %s", path, e)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {name: str(data[name]) for name in VALIDATOR_HEADERS if data.get(name)}
+
+    def put(
+        self,
+        kind: str,
+        method: str,
+        pdf_url: str,
+        content: str,
+        options: dict[str, Any] | None = None,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        """Store ``content`` and its validators atomically. Failures are logged, never raised."""
+        path = self.path(kind, method, pdf_url, options)
+        validators_path = path.with_suffix(".json")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, content)
+            if validators:
+                self._write_atomic(validators_path, json.dumps(validators, sort_keys=True))
+            else:
+                validators_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        fd, temp_name = tempfile.mkstemp(prefix=".cache_", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
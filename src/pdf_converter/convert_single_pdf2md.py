@@ -15,16 +15,18 @@ if __name__ == "__main__":
 
     input_path = Path(sys.argv[1])
     method = sys.argv[2]
-    converter = Converter(lib=method, input_file=input_path)
+    # With an output path the Markdown is written there; otherwise it goes to stdout.
+    output_path = Path(sys.argv[3]) if len(sys.argv) > 3 else None
+    converter = Converter(lib=method, input_file=input_path, output_file=output_path)
     try:
         converter.convert()
-        content = converter.output_file.read_text(encoding="utf-8")
         if converter.last_error:
             print(f"[ERROR] Conversion failed: {converter.last_error}", file=sys.stderr)
             sys.exit(1)
-        if not content.strip():
+        if not converter.md_content.strip():
             print("[WARN] Conversion produced no content", file=sys.stderr)
-        sys.stdout.write(content)
+        if output_path is None:
+            sys.stdout.write(converter.md_content)
     except MissingBackendDependency as e:
         print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(EXIT_MISSING_DEPENDENCY)
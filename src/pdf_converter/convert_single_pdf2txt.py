@@ -12,10 +12,13 @@ from pdf_converter.pdf2txt import TextConverter
 if __name__ == "__main__":
     input_path = Path(sys.argv[1])
     method = sys.argv[2]
-    converter = TextConverter(lib=method, input_file=input_path)
+    # With an output path the text is written there; otherwise it goes to stdout.
+    output_path = Path(sys.argv[3]) if len(sys.argv) > 3 else None
+    converter = TextConverter(lib=method, input_file=input_path, output_file=output_path)
     try:
         converter.convert()
-        sys.stdout.write(converter.output_file.read_text(encoding="utf-8"))
+        if output_path is None:
+            sys.stdout.write(converter.txt_content)
     except MissingBackendDependency as e:
         print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(EXIT_MISSING_DEPENDENCY)
@@ -285,6 +285,8 @@ def build_source_payload(
     *,
     source_url: str | None = None,
     input_file: Path | None = None,
+    file_content: bytes | None = None,
+    filename: str | None = None,
     source_headers: dict[str, str] | None = None,
     return_as_file: bool = False,
     document_timeout: float = DEFAULT_DOCUMENT_TIMEOUT_SECONDS,
@@ -292,24 +294,28 @@ def build_source_payload(
 ) -> dict[str, Any]:
     """Build a ``ConvertDocumentsRequest`` body for ``/v1/convert/source/async``.
 
-    Provide either ``source_url`` (HTTP fetch by Docling Serve) or ``input_file``
-    (base64 ``FileSourceRequest``). URL is preferred when both are given.
+    Provide either ``source_url`` (HTTP fetch by Docling Serve), ``input_file``
+    or in-memory ``file_content`` (both sent as a base64 ``FileSourceRequest``).
+    URL is preferred over a file, and ``file_content`` over ``input_file``.
     """
     if source_url:
         source: dict[str, Any] = {"kind": "http", "url": source_url}
         if source_headers:
             source["headers"] = source_headers
         source_label = source_url
-    elif input_file is not None:
-        encoded = base64.b64encode(input_file.read_bytes()).decode("ascii")
+    elif file_content is not None or input_file is not None:
+        if file_content is None:
+            file_content = input_file.read_bytes()
+        if filename is None:
+            filename = input_file.name if input_file is not None else "document.pdf"
         source = {
             "kind": "file",
-            "filename": input_file.name,
-            "base64_string": encoded,
+            "filename": filename,
+            "base64_string": base64.b64encode(file_content).decode("ascii"),
         }
-        source_label = input_file.name
+        source_label = filename
     else:
-        raise DoclingServeError("Either source_url or input_file is required.")
+        raise DoclingServeError("Either source_url, input_file or file_content is required.")
 
     return_as_file = bool(conversion_options.pop("return_as_file", return_as_file))
     payload = {
@@ -603,6 +609,8 @@ def fetch_result(
 def convert_file_to_markdown(
     input_file: Path | None = None,
     *,
+    file_content: bytes | None = None,
+    filename: str | None = None,
     source_url: str | None = None,
     source_headers: dict[str, str] | None = None,
     poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
@@ -622,7 +630,10 @@ def convert_file_to_markdown(
 
     Args:
         input_file: Local PDF to send as a base64 ``FileSourceRequest``. Ignored
-            when ``source_url`` is set.
+            when ``source_url`` or ``file_content`` is set.
+        file_content: PDF bytes already in memory, sent like ``input_file``
+            without a round-trip through disk.
+        filename: Name reported to Docling Serve for ``file_content``.
         source_url: HTTP(S) URL for Docling Serve to fetch (``HttpSourceRequest``).
         source_headers: Optional headers Docling Serve should use when fetching
             ``source_url`` (e.g. authorization for the PDF host).
@@ -650,11 +661,13 @@ def convert_file_to_markdown(
     payload = build_source_payload(
         source_url=source_url,
         input_file=input_file,
+        file_content=file_content,
+        filename=filename,
         source_headers=source_headers,
         document_timeout=document_timeout,
         **conversion_options,
     )
-    label = source_url or (input_file.name if input_file is not None else "unknown")
+    label = source_url or filename or (input_file.name if input_file is not None else "unknown")
 
     with httpx.Client(verify=verify, timeout=None) as client:
         task_id = submit_source_task(
@@ -23,17 +23,47 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 IMAGE_FOLDER = Path("./images")
+# Already-compressed formats gain nothing from deflate, so they are stored as is.
+_STORED_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".zip", ".gz"})
+# A multiple of 3 bytes, so only the last chunk of a file gets base64 padding.
+_BASE64_CHUNK_SIZE = 57 * 1024
+
+
+def _data_link(path: Path, mime_type: str, link_text: str) -> str:
+    """Return an HTML link that downloads ``path`` from an inline base64 data URI."""
+    # Encode chunk by chunk so the raw file is never held in memory as a whole. Base64
+    # output is pure ASCII, which decodes faster than through the default UTF-8 codec.
+    with path.open("rb") as f:
+        chunks = iter(lambda: f.read(_BASE64_CHUNK_SIZE), b"")
+        b64 = b"".join(base64.b64encode(chunk) for chunk in chunks).decode("ascii")
+    return f'<a href="data:file/{mime_type};base64,{b64}" download="{path.name}">{link_text}</a>'
+
+
+def _add_folder_to_zip(zipf: zipfile.ZipFile, folder: Path, arc_prefix: Path) -> None:
+    """Add every file below ``folder`` under ``arc_prefix``, storing already-compressed formats as is."""
+    for file_path in folder.rglob("*"):
+        if not file_path.is_file():
+            continue
+        compress_type = zipfile.ZIP_STORED if file_path.suffix.lower() in _STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+        zipf.write(file_path, arc_prefix / file_path.relative_to(folder), compress_type=compress_type)
 
 
 class Converter:
-    """Convert a single PDF to Markdown with the backend named ``lib``."""
+    """Convert a single PDF to Markdown with the backend named ``lib``.
+
+    The result is written to ``output_file``; without one, a temporary file is
+    used and removed again by :meth:`cleanup`.
+    """
 
-    def __init__(self, lib: str, input_file: Path):
+    def __init__(self, lib: str, input_file: Path, output_file: Path | None = None):
         self.lib = lib
         self.input_file = input_file
-        fd, temp_path = tempfile.mkstemp(suffix=".md")
-        os.close(fd)
-        self.output_file = Path(temp_path)
+        self._owns_output_file = output_file is None
+        if output_file is None:
+            fd, temp_path = tempfile.mkstemp(suffix=".md")
+            os.close(fd)
+            output_file = Path(temp_path)
+        self.output_file = Path(output_file)
         self.doc_image_folder = IMAGE_FOLDER / self.output_file.stem
         self.md_content = ""
         self.create_image_zip_file = False
@@ -41,7 +71,8 @@ class Converter:
 
     def cleanup(self):
         """Remove the temporary output file and any per-document image folder."""
-        self.output_file.unlink(missing_ok=True)
+        if self._owns_output_file:
+            self.output_file.unlink(missing_ok=True)
         if self.doc_image_folder.exists():
             shutil.rmtree(self.doc_image_folder, ignore_errors=True)
 
@@ -55,40 +86,28 @@ class Converter:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_zip_file:
             temp_zip_path = Path(tmp_zip_file.name)
 
-        with zipfile.ZipFile(temp_zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(temp_zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
             if self.output_file.exists():
                 zipf.write(self.output_file, self.output_file.name)
 
             if self.doc_image_folder.exists():
-                for root, _, files in os.walk(self.doc_image_folder):
-                    for file in files:
-                        file_path = Path(root) / file
-                        zipf.write(file_path, Path("images") / file)
+                _add_folder_to_zip(zipf, self.doc_image_folder, Path("images"))
         return Path(temp_zip_path)
 
     def get_zipped_images(self):
         self.doc_image_folder.mkdir(parents=True, exist_ok=True)
-        shutil.make_archive(str(self.doc_image_folder), "zip", self.doc_image_folder)
-        return f"{self.doc_image_folder}.zip"
+        zip_path = f"{self.doc_image_folder}.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            _add_folder_to_zip(zipf, self.doc_image_folder, Path())
+        return zip_path
 
     def get_file_download_link(self, link_text: str):
         """Generate a download link for an existing file"""
         if self.create_image_zip_file and self.output_file.exists():
-            zip_file = self.zip_markdown_doc_with_images()
-            with zip_file.open("rb") as f:
-                bytes_data = f.read()
-            b64 = base64.b64encode(bytes_data).decode()
-            mime_type = "application/zip"
-            href = f'<a href="data:file/{mime_type};base64,{b64}" download="{zip_file.name}">{link_text}</a>'
-            return href
+            return _data_link(self.zip_markdown_doc_with_images(), "application/zip", link_text)
         elif self.output_file.exists():
-            with self.output_file.open("rb") as f:
-                bytes_data = f.read()
-            b64 = base64.b64encode(bytes_data).decode()
             mime_type = "application/pdf" if self.output_file.suffix == ".pdf" else "text/markdown"
-            filename = os.path.basename(self.output_file)
-            href = f'<a href="data:file/{mime_type};base64,{b64}" download="{filename}">{link_text}</a>'
-            return href
+            return _data_link(self.output_file, mime_type, link_text)
         return None
 
     def convert(self, **options):
@@ -8,22 +8,39 @@ from pdf_converter import backends
 
 
 class TextConverter:
-    """Convert a single PDF to plain text with the backend named ``lib``."""
+    """Convert a single PDF to plain text with the backend named ``lib``.
 
-    def __init__(self, lib: str, input_file: Path):
+    The result is written to ``output_file``; without one, a temporary file is
+    used and removed again by :meth:`cleanup`.
+    """
+
+    def __init__(self, lib: str, input_file: Path, output_file: Path | None = None):
         self.lib = lib.lower()
         self.input_file = input_file
-        fd, temp_path = tempfile.mkstemp(suffix=".txt")
-        os.close(fd)
-        self.output_file = Path(temp_path)
-        self.txt_content = ""
+        self._owns_output_file = output_file is None
+        if output_file is None:
+            fd, temp_path = tempfile.mkstemp(suffix=".txt")
+            os.close(fd)
+            output_file = Path(temp_path)
+        self.output_file = Path(output_file)
 
     def cleanup(self):
         """Remove the temporary output file."""
-        self.output_file.unlink(missing_ok=True)
+        if self._owns_output_file:
+            self.output_file.unlink(missing_ok=True)
+
+    @property
+    def txt_content(self) -> str:
+        """The converted text, read back from ``self.output_file``."""
+        try:
+            return self.output_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return ""
 
     def convert(self):
-        """Run the conversion and write the result to ``self.output_file``."""
-        self.txt_content = backends.convert_to_text(self.lib, self.input_file)
+        """Run the conversion and write the result to ``self.output_file`` page by page."""
         with open(self.output_file, "w", encoding="utf-8") as f:
-            f.write(self.txt_content)
+            for page_num, page_text in enumerate(backends.iter_text(self.lib, self.input_file)):
+                if page_num:
+                    f.write("\n")
+                f.write(page_text)